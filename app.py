@@ -1,6 +1,5 @@
 import streamlit as st
 import os
-import google.generativeai as genai
 from dotenv import load_dotenv
 
 # Load environment variables from .env file (for local development)
@@ -15,21 +14,38 @@ if not gemini_api_key:
     st.error("GEMINI_API_KEY environment variable not set. Please set it in secrets or .env file.")
     st.stop()
 
-# Configure the Generative AI client
-genai.configure(api_key=gemini_api_key)
-
 # 2. Initialize the Generative Model
-# NOTE: Using the positional argument syntax required for google-generativeai==0.8.5
-try:
+# Cached so the client is configured once per process instead of on every rerun
+@st.cache_resource
+def get_model(api_key):
+    # Imported here so the SDK only loads when the model is first built
+    import google.generativeai as genai
+
+    # Configure the Generative AI client
+    genai.configure(api_key=api_key)
+    # NOTE: Using the positional argument syntax required for google-generativeai==0.8.5
     # Pass "gemini-pro" as a positional argument!
-    model = genai.GenerativeModel("gemini-pro") 
+    return genai.GenerativeModel("gemini-pro")
+
+try:
+    model = get_model(gemini_api_key)
 except Exception as e:
     st.error(f"Error initializing chat model: {e}")
     st.stop()
+
+# Number of user/assistant exchanges kept in the UI and sent to the model
+MAX_TURNS = 20
     
 # 3. Streamlit App Setup
 st.title("Simple Streamlit Gemini Chat")
 
+# Let the browser skip layout and paint for chat messages scrolled out of view
+st.markdown(
+    "<style>div[data-testid='stChatMessage']"
+    "{content-visibility:auto;contain-intrinsic-size:auto 120px;}</style>",
+    unsafe_allow_html=True,
+)
+
 # Initialize chat history in Streamlit session state
 if "chat" not in st.session_state:
     # Use the model's start_chat method
@@ -45,19 +61,55 @@ for message in st.session_state.messages:
 
 # Handle user input
 if prompt := st.chat_input("Ask a question..."):
-    # Add user message to history and display
-    st.session_state.messages.append({"role": "user", "content": prompt})
+    # Display user message
     with st.chat_message("user"):
         st.markdown(prompt)
 
-    # Get model response
-    with st.spinner("Gemini is thinking..."):
-        # Send message to the chat session
-        response = st.session_state.chat.send_message(prompt)
-        
-    # Display assistant response
-    with st.chat_message("assistant"):
-        st.markdown(response.text)
-        
-    # Add assistant response to history
-    st.session_state.messages.append({"role": "assistant", "content": response.text})
+    chat = st.session_state.chat
+    # Snapshot the model history so a failed reply can be undone; a streamed
+    # reply that breaks partway would otherwise poison the session for good
+    history_before = chat.history
+    history = None
+
+    try:
+        # Get model response
+        with st.spinner("Gemini is thinking..."):
+            # Send message to the chat session, streaming the reply in chunks
+            response = chat.send_message(prompt, stream=True)
+
+        # Display assistant response as the chunks arrive
+        with st.chat_message("assistant"):
+            # Chunks carrying only a finish_reason have no parts and usage-only
+            # chunks have no candidates; .text and .parts raise on them
+            full_response = st.write_stream(
+                chunk.text for chunk in response if chunk.candidates and chunk.parts
+            )
+
+        # Reading the history raises if the stream ended on a blocked
+        # finish_reason (SAFETY, RECITATION, ...), so do it while guarded
+        history = chat.history
+    except Exception as e:
+        # Imported here to keep the SDK import deferred to get_model
+        from google.generativeai.types import BrokenResponseError, StopCandidateException
+
+        if isinstance(e, (BrokenResponseError, StopCandidateException)):
+            # The session has already been rolled back, so the SDK's advice to
+            # call chat.rewind() is not for the user
+            st.error("Gemini stopped this reply (e.g. blocked by safety filters); try rephrasing.")
+        else:
+            st.error(f"Error generating response: {e}")
+        st.stop()
+    finally:
+        # Undo the exchange whenever it won't be recorded in messages, including
+        # when Streamlit interrupts the run mid-stream for a newer prompt
+        if history is None:
+            chat.history = history_before
+
+    # Add the whole exchange to history in one update, keeping only the last
+    # MAX_TURNS exchanges so prompt size and re-render cost stay bounded
+    messages = st.session_state.messages + [
+        {"role": "user", "content": prompt},
+        {"role": "assistant", "content": full_response},
+    ]
+    st.session_state.messages = messages[-2 * MAX_TURNS:]
+    chat.history = history[-2 * MAX_TURNS:]